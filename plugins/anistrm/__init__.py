@@ -1,18 +1,22 @@
 
+import json
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 import pytz
+import requests
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from app.utils.http import RequestUtils
+from requests.adapters import HTTPAdapter
 from app.core.config import settings
 from app.plugins import _PluginBase
 from typing import Any, List, Dict, Tuple, Optional
 from app.log import logger
-import xml.dom.minidom
-from app.utils.dom import DomUtils
-from urllib.parse import quote  # ★ 修正：缺失的匯入
+import xml.etree.ElementTree as ET
+from urllib.parse import quote, urlsplit, urlunsplit  # ★ 修正：缺失的匯入
 
 def retry(ExceptionToCheck: Any,
           tries: int = 3, delay: int = 3, backoff: int = 1, logger: Any = None, ret: Any = None):
@@ -74,9 +78,14 @@ class ANiStrm(_PluginBase):
     _fulladd = False
     _storageplace = None
     _date = None
+    # RSS 协商缓存：Last-Modified 与上次解析结果，304 时免去下载与解析
+    _last_rss_mtime = None
+    _last_rss_items: List[Dict[str, str]] = []
 
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
+    # 共享 HTTP 会话：连接池复用 TCP+TLS，跨定时任务不再重复握手
+    _session: Optional[requests.Session] = None
 
     def init_plugin(self, config: dict = None):
         # 停止现有任务
@@ -87,6 +96,12 @@ class ANiStrm(_PluginBase):
             self._onlyonce = config.get("onlyonce")
             self._fulladd = config.get("fulladd")
             self._storageplace = config.get("storageplace")
+            # 存储目录只在这里确保一次，写文件热路径上不再逐个检查
+            if self._storageplace:
+                try:
+                    os.makedirs(self._storageplace, exist_ok=True)
+                except Exception as e:
+                    logger.error(f"创建存储目录失败：{self._storageplace}, {e}")
 
         # 加载模块
         if self._enabled or self._onlyonce:
@@ -95,10 +110,15 @@ class ANiStrm(_PluginBase):
 
             if self._enabled and self._cron:
                 try:
+                    # retry 装饰器断网时会在任务线程里阻塞重试，
+                    # 合并积压的触发并限制单实例，避免拖垮调度线程池里的其他任务
                     self._scheduler.add_job(
                         func=self.__task,
                         trigger=CronTrigger.from_crontab(self._cron),
-                        name="ANiStrm文件创建"
+                        name="ANiStrm文件创建",
+                        coalesce=True,
+                        max_instances=1,
+                        misfire_grace_time=300
                     )
                     logger.info(f'ANi-Strm定时任务创建成功：{self._cron}')
                 except Exception as err:
@@ -121,37 +141,95 @@ class ANiStrm(_PluginBase):
                 self._scheduler.print_jobs()
                 self._scheduler.start()
 
-    def __get_ani_season(self, idx_month: int = None) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _season_key(year: int, month: int) -> str:
         """
-        按 1/4/7/10 分季，返回例如 '2026-1'
-        保留 idx_month 兼容，但默认为系统月份
+        按 1/4/7/10 分季，返回例如 '2026-1'；纯函数，按 (年, 月) 缓存
         """
-        current_date = datetime.now()
-        year = current_date.year
-        month = idx_month if idx_month else current_date.month
-
-        if month in [1, 2, 3]:
+        if month in (1, 2, 3):
             season = 1
-        elif month in [4, 5, 6]:
+        elif month in (4, 5, 6):
             season = 4
-        elif month in [7, 8, 9]:
+        elif month in (7, 8, 9):
             season = 7
         else:
             season = 10
+        return f'{year}-{season}'
 
-        self._date = f'{year}-{season}'
+    def __get_ani_season(self, idx_month: int = None) -> str:
+        """
+        保留 idx_month 兼容，但默认为系统月份
+        """
+        current_date = datetime.now()
+        self._date = self._season_key(current_date.year,
+                                      idx_month if idx_month else current_date.month)
         return self._date
 
+    def _get_session(self) -> requests.Session:
+        """
+        惰性创建共享 Session，两处抓取与历次定时任务复用同一连接池
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
+    def _request_headers(self, extra: dict = None) -> Optional[dict]:
+        headers = {}
+        if settings.USER_AGENT:
+            headers['User-Agent'] = settings.USER_AGENT
+        if extra:
+            headers.update(extra)
+        return headers or None
+
+    def __season_cache_file(self) -> Optional[str]:
+        return os.path.join(self._storageplace, '.season_cache.json') if self._storageplace else None
+
+    def __load_season_cache(self) -> Optional[dict]:
+        cache_file = self.__season_cache_file()
+        if not cache_file or not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except Exception:
+            return None
+
+    def __save_season_cache(self, url: str, etag: str, names: List[str]):
+        cache_file = self.__season_cache_file()
+        if not cache_file or not etag:
+            return
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as file:
+                json.dump({'url': url, 'etag': etag, 'names': names}, file, ensure_ascii=False)
+        except Exception as e:
+            logger.debug(f'写入当季列表缓存失败：{e}')
+
     @retry(Exception, tries=3, logger=logger, ret=[])
     def get_current_season_list(self) -> List[str]:
         """
-        兼容新舊回傳結構：既可能是 {'files': [...]} 也可能是 {'list': [...]}
+        兼容新舊回傳結構：既可能是 {'files': [...]} 也可能是 {'list': [...]}；
+        带 ETag 协商缓存，列表未变化时直接复用本地结果，免去下载与解析
         """
         url = f'https://openani.an-i.workers.dev/{self.__get_ani_season()}/'
-        rep = RequestUtils(
-            ua=settings.USER_AGENT if settings.USER_AGENT else None,
-            proxies=settings.PROXY if settings.PROXY else None
-        ).post(url=url)
+        cached = self.__load_season_cache()
+        extra = None
+        if cached and cached.get('etag') and cached.get('url') == url:
+            extra = {'If-None-Match': cached['etag']}
+        rep = self._get_session().post(
+            url,
+            headers=self._request_headers(extra),
+            proxies=settings.PROXY if settings.PROXY else None,
+            timeout=30
+        )
+
+        if cached and getattr(rep, 'status_code', None) == 304:
+            logger.debug('当季文件列表未变化，使用本地缓存')
+            return cached.get('names') or []
 
         logger.debug(getattr(rep, "text", ""))
 
@@ -168,6 +246,8 @@ class ANiStrm(_PluginBase):
             name = item.get('name') if isinstance(item, dict) else item
             if isinstance(name, str) and name.strip():
                 names.append(name.strip())
+
+        self.__save_season_cache(url, rep.headers.get('ETag'), names)
         return names
 
     @retry(Exception, tries=3, logger=logger, ret=[])
@@ -176,32 +256,56 @@ class ANiStrm(_PluginBase):
         解析 ani-download.xml，並將連結主機替換為 openani，且立即正規化為 .mp4?d=true
         """
         addr = 'https://api.ani.rip/ani-download.xml'
-        ret = RequestUtils(
-            ua=settings.USER_AGENT if settings.USER_AGENT else None,
-            proxies=settings.PROXY if settings.PROXY else None
-        ).get_res(addr)
+        extra = {'If-Modified-Since': self._last_rss_mtime} if self._last_rss_mtime else None
+        ret = self._get_session().get(
+            addr,
+            headers=self._request_headers(extra),
+            proxies=settings.PROXY if settings.PROXY else None,
+            timeout=30
+        )
+
+        # 304：内容未变化，直接复用上次解析结果，整个 XML 解析跳过
+        if self._last_rss_mtime and getattr(ret, 'status_code', None) == 304:
+            logger.debug('RSS 未变化，使用上次解析结果')
+            return self._last_rss_items
 
-        ret_xml = ret.text
         ret_array: List[Dict[str, str]] = []
 
-        # 解析XML
-        dom_tree = xml.dom.minidom.parseString(ret_xml)
-        rootNode = dom_tree.documentElement
-        items = rootNode.getElementsByTagName("item")
-
-        for item in items:
+        # 解析XML：ElementTree 是 C 实现的单趟解析，不构建完整 DOM 树；
+        # 直接喂 bytes，编码交给 expat 按 XML 声明处理，省掉一次解码
+        root = ET.fromstring(ret.content)
+        for item in root.iter("item"):
             rss_info: Dict[str, str] = {}
             # 标题
-            title = DomUtils.tag_value(item, "title", default="")
+            title = (item.findtext("title") or "").strip()
             # 链接
-            link = DomUtils.tag_value(item, "link", default="")
-            fixed = link.replace("resources.ani.rip", "openani.an-i.workers.dev")
+            link = (item.findtext("link") or "").strip()
             rss_info['title'] = title
-            rss_info['link'] = self._normalize_openani_url(fixed)
+            rss_info['link'] = self._rewrite_ani_link(link)
             ret_array.append(rss_info)
 
+        self._last_rss_mtime = ret.headers.get('Last-Modified')
+        self._last_rss_items = ret_array
         return ret_array
 
+    @staticmethod
+    def _rewrite_ani_link(link: str) -> str:
+        """
+        resources.ani.rip 链接单趟重建为 openani 可播放直链：
+        换 netloc、补 .mp4 后缀、查询串统一为 d=true，只做一次字符串重组
+        """
+        if not link:
+            return ""
+        parts = urlsplit(link)
+        path = parts.path if parts.path.endswith('.mp4') else f'{parts.path}.mp4'
+        return urlunsplit((parts.scheme, 'openani.an-i.workers.dev', path, 'd=true', ''))
+
+    # 预编译的后缀正规化规则：剥掉已有的后缀变体，统一补成 .mp4?d=true
+    _NORM_RE = re.compile(r'(?:\.mp4\?d=true|\?d=mp4|\.mp4)?$')
+    # 正规化结果缓存：同一链接在 get_latest_list 与 __touch_strm_file 各会经过一次，
+    # 且 RSS 条目跨任务重复出现
+    _norm_cache: Dict[str, str] = {}
+
     def _normalize_openani_url(self, url: str) -> str:
         """
         將 openani URL 統一轉成 Emby / Jellyfin 可播放格式
@@ -209,27 +313,22 @@ class ANiStrm(_PluginBase):
         """
         if not url:
             return ""
-        if url.endswith(".mp4?d=true"):
-            return url
-        if "?d=mp4" in url:
-            return url.replace("?d=mp4", ".mp4?d=true")
-        if url.endswith(".mp4"):
-            return f"{url}?d=true"
-        return f"{url}.mp4?d=true"
-
-    def __touch_strm_file(self, file_name: str, file_url: str = None) -> bool:
+        cached = self._norm_cache.get(url)
+        if cached is not None:
+            return cached
+        # 单次 C 正则替换取代逐个 endswith/in/replace 的分支链
+        normalized = self._NORM_RE.sub('.mp4?d=true', url, count=1)
+        if len(self._norm_cache) >= 1024:
+            self._norm_cache.clear()
+        self._norm_cache[url] = normalized
+        return normalized
+
+    def __touch_strm_file(self, file_name: str, file_url: str = None, existing: set = None) -> bool:
         """
         建立 .strm 檔；若提供 file_url 則正規化為 .mp4?d=true，
-        若不提供則使用季路徑 + 檔名（進行百分號編碼）
+        若不提供則使用季路徑 + 檔名（進行百分號編碼）；
+        existing 為 __task 預先掃描的既有檔名集合，命中時免去逐檔 stat
         """
-        # 確保目錄存在
-        try:
-            if self._storageplace and not os.path.exists(self._storageplace):
-                os.makedirs(self._storageplace, exist_ok=True)
-        except Exception as e:
-            logger.error(f"创建存储目录失败：{self._storageplace}, {e}")
-            return False
-
         if not file_url:
             encoded_filename = quote(file_name, safe='')
             src_url = f'https://openani.an-i.workers.dev/{self._date}/{encoded_filename}.mp4?d=true'
@@ -237,35 +336,68 @@ class ANiStrm(_PluginBase):
             src_url = self._normalize_openani_url(file_url)
 
         file_path = f'{self._storageplace}/{file_name}.strm'
-        if os.path.exists(file_path):
+        strm_name = f'{file_name}.strm'
+        if existing is not None and strm_name in existing:
             logger.debug(f'{file_name}.strm 文件已存在')
             return False
 
         try:
-            with open(file_path, 'w') as file:
-                file.write(src_url)
+            # O_EXCL 把存在性检查与创建合并为一次系统调用，
+            # 同时消除 check-then-create 的竞态窗口
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            logger.debug(f'{file_name}.strm 文件已存在')
+            return False
+        except Exception as e:
+            logger.error('创建strm源文件失败：' + str(e))
+            return False
+
+        try:
+            # 直接写 bytes：跳过文本 IO 包装层的编码器构建与换行翻译，
+            # 不做 fsync，strm 内容丢失可在下次运行时重建
+            os.write(fd, src_url.encode('utf-8'))
+            if existing is not None:
+                existing.add(strm_name)
             logger.debug(f'创建 {file_name}.strm 文件成功')
             return True
         except Exception as e:
             logger.error('创建strm源文件失败：' + str(e))
             return False
+        finally:
+            os.close(fd)
 
     def __task(self, fulladd: bool = False):
         cnt = 0
+        # 季度串在任务开始时解析一次，后续逐文件的 URL 拼接不再读系统时间
+        self.__get_ani_season()
+        # 存储目录内容一次读入，存在性检查从每文件一次 stat 降为一次 readdir
+        try:
+            existing = {entry.name for entry in os.scandir(self._storageplace)}
+        except (FileNotFoundError, TypeError):
+            existing = set()
         # 增量添加更新（Top15）
         if not fulladd:
             rss_info_list = self.get_latest_list()
             logger.info(f'本次处理 {len(rss_info_list)} 个文件')
             for rss_info in rss_info_list:
-                if self.__touch_strm_file(file_name=rss_info['title'], file_url=rss_info['link']):
+                if self.__touch_strm_file(file_name=rss_info['title'], file_url=rss_info['link'],
+                                          existing=existing):
                     cnt += 1
         # 全量添加当季
         else:
             name_list = self.get_current_season_list()
             logger.info(f'本次处理 {len(name_list)} 个文件')
-            for file_name in name_list:
-                if self.__touch_strm_file(file_name=file_name):
-                    cnt += 1
+            # URL 模板整个任务只拼一次，循环内只做檔名的百分号编码
+            tpl = f'https://openani.an-i.workers.dev/{self._date}/{{}}.mp4?d=true'
+            # 写 strm 是释放 GIL 的纯 I/O，线程池并行 open/write/close
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(executor.map(
+                    lambda file_name: self.__touch_strm_file(
+                        file_name=file_name,
+                        file_url=tpl.format(quote(file_name, safe='')),
+                        existing=existing),
+                    name_list))
+            cnt += sum(results)
 
         logger.info(f'新创建了 {cnt} 个strm文件')
 
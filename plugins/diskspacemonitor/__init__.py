@@ -0,0 +1,784 @@
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.core.config import settings
+from app.core.event import eventmanager, Event
+from app.log import logger
+from app.plugins import _PluginBase
+from app.schemas.types import EventType, NotificationType
+
+if os.name == "posix":
+    def _disk_usage(path: str) -> Tuple[int, int, int]:
+        """
+        POSIX 下直接 statvfs，省去 shutil.disk_usage 的一层 Python 封装；
+        used 口径与 shutil 保持一致（含 root 保留块）
+        """
+        st = os.statvfs(path)
+        frsize = st.f_frsize
+        total = st.f_blocks * frsize
+        used = (st.f_blocks - st.f_bfree) * frsize
+        free = st.f_bavail * frsize
+        return total, used, free
+else:
+    def _disk_usage(path: str) -> Tuple[int, int, int]:
+        return tuple(shutil.disk_usage(path))
+
+
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+@lru_cache(maxsize=256)
+def _fmt_bytes(size: int) -> str:
+    """
+    字节数转可读字符串，bit_length 直接定位单位，免去逐级除法；
+    total/used 在相邻两次检查间往往不变，lru_cache 直接复用格式化结果
+    """
+    size = int(size)
+    if size <= 0:
+        return "0 B"
+    i = min((size.bit_length() - 1) // 10, len(_UNITS) - 1)
+    return f"{size / (1 << (i * 10)):.2f} {_UNITS[i]}"
+
+
+class DiskSpaceMonitor(_PluginBase):
+    # 插件名称
+    plugin_name = "硬盘空间监控"
+    # 插件描述
+    plugin_desc = "定时检查监控路径的剩余空间，低于阈值时发送通知提醒。"
+    # 插件图标
+    plugin_icon = "https://raw.githubusercontent.com/honue/MoviePilot-Plugins/main/icons/diskmonitor.png"
+    # 插件版本
+    plugin_version = "1.0"
+    # 插件作者
+    plugin_author = "honue"
+    # 作者主页
+    author_url = "https://github.com/honue"
+    # 插件配置项ID前缀
+    plugin_config_prefix = "diskspacemonitor_"
+    # 加载顺序
+    plugin_order = 30
+    # 可使用的用户级别
+    auth_level = 1
+
+    # 私有属性
+    _enabled = False
+    # 监控路径（归一化后的绝对路径，保序去重）
+    _paths: Tuple[str, ...] = ()
+    # 剩余空间阈值（百分比）
+    _threshold_pct = 10.0
+    # 恢复通知的迟滞余量（百分比），高于 阈值+余量 才算恢复，避免在阈值附近反复告警
+    _recover_margin_pct = 2.0
+    # 检查间隔（分钟）
+    _interval_minutes = 30
+    # 当前生效的检查间隔（分钟），空间充裕时自动放大
+    _current_interval = 30
+    # 同一路径重复告警冷却（分钟）
+    _cooldown_minutes = 120
+    # 低于阈值后只告警一次，恢复后重新激活
+    _only_once_until_recover = True
+    # 忽略不存在的路径
+    _ignore_missing_path = False
+
+    # init_plugin 预计算的派生常量，检查循环内不再重复换算
+    _cooldown_s = 7200
+    _threshold_frac = 0.10
+    _recover_frac = 0.12
+
+    # 定时器
+    _scheduler: Optional[BackgroundScheduler] = None
+    # 告警状态：路径 -> 上次告警时间
+    _last_alert_at: Dict[str, float] = {}
+    # 告警状态：路径 -> 是否已在阈值以下告警过
+    _alerted_under_threshold: Dict[str, bool] = {}
+    # statfs TTL 缓存：设备号/路径 -> (时间戳, (total, used, free))，不存在的路径缓存 None
+    _stat_cache: Dict[Any, Tuple[float, Optional[Tuple[int, int, int]]]] = {}
+    _stat_ttl = 2.0
+    # 路径 -> 设备号，同一文件系统的多个路径共享同一条 statfs 缓存
+    _dev_of: Dict[str, int] = {}
+    # statfs 线程池：多路径（NAS/网络挂载）时并发探测，耗时从 sum 降到 max
+    _pool: Optional[ThreadPoolExecutor] = None
+    # (路径, 异常类型) -> 上次记录完整堆栈的时间，用于日志限流
+    _last_tb_log: Dict[Tuple[str, str], float] = {}
+    # api_status 的结果缓存：(时间戳, payload)，TTL 窗口内的重复轮询直接复用
+    _status_cache: Tuple[float, Optional[List[Dict[str, Any]]]] = (0.0, None)
+
+    def init_plugin(self, config: dict = None):
+        if config:
+            self._enabled = config.get("enabled", False)
+            self._paths = self._parse_paths(config.get("paths"))
+            self._threshold_pct = float(config.get("threshold_pct", 10))
+            self._recover_margin_pct = float(config.get("recover_margin_pct", 2))
+            self._interval_minutes = int(config.get("interval_minutes", 30))
+            self._cooldown_minutes = int(config.get("cooldown_minutes", 120))
+            self._only_once_until_recover = config.get("only_once_until_recover", True)
+            self._ignore_missing_path = config.get("ignore_missing_path", False)
+
+        # 配置变更后丢弃旧的状态缓存
+        self._status_cache = (0.0, None)
+
+        # 预计算派生常量
+        self._cooldown_s = self._cooldown_minutes * 60
+        self._threshold_frac = self._threshold_pct / 100.0
+        self._recover_frac = (self._threshold_pct + self._recover_margin_pct) / 100.0
+
+        # 冷启动时恢复上次退出前的告警状态，避免重启后对仍低于阈值的路径重复告警
+        if not self._last_alert_at and not self._alerted_under_threshold:
+            saved = self.get_data("alert_state") or {}
+            if saved:
+                mono_now = time.monotonic()
+                epoch_now = time.time()
+                max_age = max(self._cooldown_s, 24 * 3600)
+                for path, epoch_ts in (saved.get("last_alert_at") or {}).items():
+                    age = epoch_now - epoch_ts
+                    # 落盘值是 epoch，折算回当前单调钟基准；过期的直接丢弃
+                    if 0 <= age < max_age:
+                        self._last_alert_at[path] = mono_now - age
+                self._alerted_under_threshold.update(saved.get("alerted") or {})
+
+        # 清理不存在的狀態
+        stale = self._last_alert_at.keys() - set(self._paths)
+        for path in stale:
+            self._last_alert_at.pop(path, None)
+            self._alerted_under_threshold.pop(path, None)
+
+        # 冷却时间戳改用单调钟后，超过当前单调钟读数的旧 epoch 值直接丢弃
+        mono_now = time.monotonic()
+        for path, ts in list(self._last_alert_at.items()):
+            if ts > mono_now:
+                self._last_alert_at.pop(path, None)
+
+        # 单路径部署（最常见）绑定特化实现：无循环、无批量缓存、不建线程池
+        if len(self._paths) == 1:
+            self._run_check = self._run_check_single
+        else:
+            self.__dict__.pop("_run_check", None)
+
+        # 路径数量可能变化，旧线程池作废，下次探测按新规模惰性重建
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+        if not self._enabled:
+            self.stop_service()
+            return
+
+        self._current_interval = self._interval_minutes
+        if self._scheduler and self._scheduler.running:
+            # 配置热更新：就地调整已有任务的触发器，不拆掉调度器重建
+            try:
+                if self._scheduler.get_job("diskmonitor.schedule"):
+                    # func 一并刷新：单路径/多路径特化绑定可能随配置切换
+                    self._scheduler.modify_job("diskmonitor.schedule", func=self._run_check)
+                    self._scheduler.reschedule_job(
+                        "diskmonitor.schedule",
+                        trigger=IntervalTrigger(minutes=self._interval_minutes)
+                    )
+                else:
+                    self._scheduler.add_job(
+                        func=self._run_check,
+                        trigger=IntervalTrigger(minutes=self._interval_minutes),
+                        id="diskmonitor.schedule",
+                        name="硬盘空间检查"
+                    )
+                logger.info(f"硬盘空间监控定时任务已更新，每 {self._interval_minutes} 分钟检查一次")
+            except Exception as err:
+                logger.error(f"定时任务配置错误：{str(err)}")
+            return
+
+        self._scheduler = BackgroundScheduler(timezone=settings.TZ)
+        try:
+            self._scheduler.add_job(
+                func=self._run_check,
+                trigger=IntervalTrigger(minutes=self._interval_minutes),
+                id="diskmonitor.schedule",
+                name="硬盘空间检查"
+            )
+            logger.info(f"硬盘空间监控定时任务创建成功，每 {self._interval_minutes} 分钟检查一次")
+        except Exception as err:
+            logger.error(f"定时任务配置错误：{str(err)}")
+        if self._scheduler.get_jobs():
+            self._scheduler.start()
+
+    @staticmethod
+    def _parse_paths(value: Any) -> Tuple[str, ...]:
+        """
+        解析配置的监控路径，支持换行或逗号分隔，归一化后去重保序
+        """
+        if not value:
+            return ("/",)
+        if isinstance(value, str):
+            parts = value.replace(",", "\n").splitlines()
+        else:
+            parts = list(value)
+        paths = [p.strip() for p in parts if p and p.strip()]
+        # realpath 归一化：尾斜杠、软链接折叠成同一挂载点，
+        # 解析到同一位置的多条配置只会产生一次 statfs；
+        # dict.fromkeys 在 C 层一次完成去重且保序
+        normalized = (os.path.realpath(p.rstrip("/\\") or "/") for p in paths)
+        return tuple(dict.fromkeys(normalized)) or ("/",)
+
+    def _cached_disk_usage(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """
+        带 TTL 的 disk_usage 缓存，短时间内重复查询同一路径时复用结果，
+        避免 _run_check / api_status / _render_status_text 各自重复 statfs
+        """
+        now = time.monotonic()
+        # 缓存键用设备号，/mnt/media 与 /mnt/media/anime 这类同盘路径共享一条缓存，
+        # statfs 次数从 O(路径数) 降到 O(文件系统数)；设备号本身只解析一次
+        key = self._dev_of.get(path)
+        if key is None:
+            try:
+                key = os.stat(path).st_dev
+                self._dev_of[path] = key
+            except OSError:
+                key = path
+        cached = self._stat_cache.get(key)
+        if cached and now - cached[0] < self._stat_ttl:
+            return cached[1]
+        try:
+            val = _disk_usage(path)
+        except (FileNotFoundError, PermissionError, NotADirectoryError):
+            # 不存在或无法访问的路径同样缓存，避免 TTL 窗口内反复探测失效挂载点；
+            # 设备号映射一并失效，挂载恢复后重新解析
+            val = None
+            self._dev_of.pop(path, None)
+        self._stat_cache[key] = (now, val)
+        return val
+
+    def _probe_one(self, path: str) -> Dict[str, Any]:
+        """
+        探测单个路径的空间信息，在线程池中执行
+        """
+        sample = {"path": path, "exists": False, "total": 0, "used": 0,
+                  "free": 0, "free_pct": 0.0, "error": None}
+        try:
+            # 不做 exists 预检：disk_usage 失败即视为路径不存在，
+            # 少一次 stat 系统调用，也消除 exists 与 statfs 之间的竞态窗口
+            usage = self._cached_disk_usage(path)
+            if not usage:
+                return sample
+            total, used, free = usage
+            sample.update({
+                "exists": True,
+                "total": total,
+                "used": used,
+                "free": free,
+                "free_pct": free / total * 100 if total else 0.0
+            })
+        except Exception as e:
+            sample["error"] = str(e)
+        return sample
+
+    def _get_pool(self) -> Optional[ThreadPoolExecutor]:
+        """
+        惰性创建线程池：首次多路径探测时才建线程，
+        此后复用同一个池，定时任务不再反复支付建线程的开销
+        """
+        if self._pool is None and len(self._paths) > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=min(16, max(4, len(self._paths))),
+                thread_name_prefix="diskmon"
+            )
+        return self._pool
+
+    def _probe_all(self) -> List[Dict[str, Any]]:
+        """
+        并发探测所有监控路径，结果按配置顺序返回
+        """
+        pool = self._get_pool()
+        if not pool:
+            return [self._probe_one(path) for path in self._paths]
+        futures = {pool.submit(self._probe_one, path): path for path in self._paths}
+        samples = {}
+        for future in as_completed(futures):
+            sample = future.result()
+            samples[sample["path"]] = sample
+        return [samples[path] for path in self._paths]
+
+    def _run_check(self) -> Dict[str, Any]:
+        """
+        检查所有监控路径的剩余空间，低于阈值时发送告警，恢复时发送通知
+        """
+        # 插件停用或未配置路径时直接返回，不做任何探测
+        if not self._enabled or not self._paths:
+            return {"ok": True, "errors": [], "samples": []}
+        errors = []
+        # 同一轮触发的多条告警/恢复先缓存，循环结束后合并为一次通知
+        pending_alerts = []
+        pending_recoveries = []
+        # 单调钟只读一次，NTP 跳变不会打乱冷却计算
+        now = time.monotonic()
+        # 循环内反复用到的属性收拢为局部变量，LOAD_FAST 替代逐次 LOAD_ATTR
+        ignore_missing = self._ignore_missing_path
+        thresh_frac = self._threshold_frac
+        recover_frac = self._recover_frac
+        cooldown_s = self._cooldown_s
+        only_once = self._only_once_until_recover
+        last_map = self._last_alert_at
+        under_map = self._alerted_under_threshold
+        samples = self._probe_all()
+        # 并发探测，告警状态机在当前线程串行处理
+        for sample in samples:
+            path = sample["path"]
+            try:
+                if sample["error"]:
+                    errors.append(f"{path}: {sample['error']}")
+                    logger.error(f"检查磁盘空间失败：{path} -> {sample['error']}")
+                    continue
+                if not sample["exists"]:
+                    if not ignore_missing:
+                        errors.append(f"路徑不存在：{path}")
+                        logger.warn(f"监控路径不存在：{path}")
+                    continue
+                total, used, free = sample["total"], sample["used"], sample["free"]
+                if not total:
+                    continue
+                free_pct = sample["free_pct"]
+                # 比例比较免去百分比换算，total 为 0 已在上面挡掉
+                if free < total * thresh_frac:
+                    # 单调钟起点是开机时刻，未告警过的路径不能用 0 兜底
+                    last = last_map.get(path)
+                    in_cooldown = last is not None and now - last < cooldown_s
+                    already_alerted = under_map.get(path, False)
+                    if in_cooldown or (only_once and already_alerted):
+                        continue
+                    pending_alerts.append((path, total, used, free, free_pct))
+                    last_map[path] = now
+                    under_map[path] = True
+                elif free >= total * recover_frac:
+                    if under_map.get(path):
+                        under_map[path] = False
+                        pending_recoveries.append((path, total, used, free, free_pct))
+            except Exception as e:
+                errors.append(f"{path}: {str(e)}")
+                self._log_check_error(path, e, now)
+        if pending_alerts or pending_recoveries:
+            self._send_batched(pending_alerts, pending_recoveries)
+        self._reschedule_adaptive(samples)
+        return {"ok": not errors, "errors": errors, "samples": samples}
+
+    def _log_check_error(self, path: str, e: Exception, now: float):
+        """
+        同一路径同一异常类型每小时只记一次完整堆栈，其余只记摘要；
+        挂载点整体失联时所有路径每个周期都会失败，避免日志写放大
+        """
+        key = (path, type(e).__name__)
+        if now - self._last_tb_log.get(key, 0) > 3600:
+            logger.error(f"检查磁盘空间失败：{path}", exc_info=True)
+            self._last_tb_log[key] = now
+        else:
+            logger.error(f"检查磁盘空间失败：{path} -> {e!r}")
+
+    def _run_check_single(self) -> Dict[str, Any]:
+        """
+        _run_check 的单路径特化版：常用常量收拢为局部变量，
+        无循环、无线程池提交、告警直接发送
+        """
+        if not self._enabled or not self._paths:
+            return {"ok": True, "errors": [], "samples": []}
+        path = self._paths[0]
+        threshold_frac = self._threshold_frac
+        under_map = self._alerted_under_threshold
+        now = time.monotonic()
+        sample = self._probe_one(path)
+        samples = [sample]
+        errors = []
+        if sample["error"]:
+            errors.append(f"{path}: {sample['error']}")
+            logger.error(f"检查磁盘空间失败：{path} -> {sample['error']}")
+        elif not sample["exists"]:
+            if not self._ignore_missing_path:
+                errors.append(f"路徑不存在：{path}")
+                logger.warn(f"监控路径不存在：{path}")
+        else:
+            total, used, free = sample["total"], sample["used"], sample["free"]
+            if total:
+                free_pct = sample["free_pct"]
+                if free < total * threshold_frac:
+                    last = self._last_alert_at.get(path)
+                    in_cooldown = last is not None and now - last < self._cooldown_s
+                    already_alerted = under_map.get(path, False)
+                    if not in_cooldown and not (self._only_once_until_recover and already_alerted):
+                        self._send_batched([(path, total, used, free, free_pct)], [])
+                        self._last_alert_at[path] = now
+                        under_map[path] = True
+                elif free >= total * self._recover_frac and under_map.get(path):
+                    under_map[path] = False
+                    self._send_batched([], [(path, total, used, free, free_pct)])
+        self._reschedule_adaptive(samples)
+        return {"ok": not errors, "errors": errors, "samples": samples}
+
+    def _reschedule_adaptive(self, samples: List[Dict[str, Any]]):
+        """
+        空间充裕时放大检查间隔，逼近阈值时恢复高频检查，减少无谓轮询
+        """
+        if not self._scheduler or not self._scheduler.running:
+            return
+        free_pcts = [sample["free_pct"] for sample in samples if sample["exists"]]
+        if not free_pcts:
+            return
+        margin = min(free_pcts) - self._threshold_pct
+        if margin <= 0:
+            next_interval = self._interval_minutes
+        else:
+            step = max(self._threshold_pct, 1.0)
+            next_interval = int(self._interval_minutes * (2 ** int(margin / step)))
+        next_interval = max(1, min(next_interval, 240))
+        if next_interval == self._current_interval:
+            return
+        try:
+            self._scheduler.reschedule_job(
+                "diskmonitor.schedule",
+                trigger=IntervalTrigger(minutes=next_interval)
+            )
+            self._current_interval = next_interval
+            logger.debug(f"硬盘空间检查间隔调整为 {next_interval} 分钟")
+        except Exception as e:
+            logger.debug(f"调整检查间隔失败：{str(e)}")
+
+    def _format_body(self, path: str, total: int, used: int, free: int, free_pct: float) -> str:
+        """
+        告警 / 恢复 / 状态三处共用的单路径空间描述
+        """
+        fmt = self._fmt_bytes
+        total_text, used_text, free_text = fmt(total), fmt(used), fmt(free)
+        return (f"路径：{path}\n"
+                f"总容量：{total_text}\n"
+                f"已使用：{used_text}\n"
+                f"剩余：{free_text}（{free_pct:.1f}%）")
+
+    def _send_batched(self, alerts: List[Tuple[str, int, int, int, float]],
+                      recoveries: List[Tuple[str, int, int, int, float]]):
+        """
+        同一轮检查触发的所有告警与恢复合并为一次通知发送，
+        通知后端（Telegram/Bark 等 webhook）每轮最多一次往返
+        """
+        sections = []
+        if alerts:
+            sections.append("🚨 空间不足\n" + "\n\n".join(self._format_body(*alert) for alert in alerts))
+        if recoveries:
+            sections.append("✅ 已恢复\n" + "\n\n".join(self._format_body(*recovery) for recovery in recoveries))
+        self.post_message(
+            mtype=NotificationType.Plugin,
+            title="🚨 硬盘空间不足" if alerts else "✅ 硬盘空间已恢复",
+            text="\n\n".join(sections)
+        )
+        for path, _, _, _, free_pct in alerts:
+            logger.info(f"硬盘空间告警：{path} 剩余 {free_pct:.1f}%")
+        for path, _, _, _, free_pct in recoveries:
+            logger.info(f"硬盘空间恢复：{path} 剩余 {free_pct:.1f}%")
+
+    _fmt_bytes = staticmethod(_fmt_bytes)
+
+    def _render_status_text(self, samples: List[Dict[str, Any]] = None) -> str:
+        """
+        渲染各监控路径的空间状态文本，用于命令回复；
+        传入 _run_check 的探测结果时直接复用，避免重复 statfs
+        """
+        if samples is None:
+            samples = self._probe_all()
+        lines = []
+        for sample in samples:
+            path = sample["path"]
+            if not sample["exists"]:
+                lines.append(f"{path}\n路徑不存在")
+                continue
+            free_pct = sample["free_pct"]
+            flag = "🚨" if free_pct < self._threshold_pct else "✅"
+            lines.append(f"{flag} {self._format_body(path, sample['total'], sample['used'], sample['free'], free_pct)}")
+        return "\n\n".join(lines) or "未配置监控路径"
+
+    @eventmanager.register(EventType.PluginAction)
+    def command_action(self, event: Event = None):
+        """
+        远程命令：立即检查并回复各路径空间状态
+        """
+        if event:
+            event_data = event.event_data
+            if not event_data or event_data.get("action") != "disk_check":
+                return
+        result = self._run_check()
+        self.post_message(
+            channel=event.event_data.get("channel") if event else None,
+            title="硬盘空间状态",
+            text=self._render_status_text(result.get("samples")),
+            userid=event.event_data.get("user") if event else None
+        )
+
+    def api_status(self) -> List[Dict[str, Any]]:
+        """
+        API：返回各监控路径的空间信息；
+        TTL 窗口内的重复轮询直接返回缓存的 payload，不再构建新对象
+        """
+        ts, payload = self._status_cache
+        if payload is not None and time.monotonic() - ts < self._stat_ttl:
+            return payload
+        result = []
+        for sample in self._probe_all():
+            if not sample["exists"]:
+                result.append({"path": sample["path"], "exists": False})
+                continue
+            total, used, free = sample["total"], sample["used"], sample["free"]
+            free_pct = sample["free_pct"]
+            result.append({
+                "path": sample["path"],
+                "exists": True,
+                "total": total,
+                "used": used,
+                "free": free,
+                "free_pct": round(free_pct, 2),
+                "free_text": self._fmt_bytes(free),
+                "total_text": self._fmt_bytes(total),
+                "under_threshold": free_pct < self._threshold_pct
+            })
+        self._status_cache = (time.monotonic(), result)
+        return result
+
+    def get_state(self) -> bool:
+        return self._enabled
+
+    @staticmethod
+    def get_command() -> List[Dict[str, Any]]:
+        return [{
+            "cmd": "/disk_check",
+            "event": EventType.PluginAction,
+            "desc": "硬盘空间检查",
+            "category": "管理",
+            "data": {
+                "action": "disk_check"
+            }
+        }]
+
+    def get_api(self) -> List[Dict[str, Any]]:
+        return [{
+            "path": "/status",
+            "endpoint": self.api_status,
+            "methods": ["GET"],
+            "summary": "硬盘空间状态",
+            "description": "查询各监控路径的剩余空间",
+        }]
+
+    def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
+        return [
+            {
+                'component': 'VForm',
+                'content': [
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'enabled',
+                                            'label': '启用插件',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'only_once_until_recover',
+                                            'label': '恢复前只告警一次',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'ignore_missing_path',
+                                            'label': '忽略不存在的路径',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'threshold_pct',
+                                            'label': '剩余空间阈值（%）',
+                                            'placeholder': '10'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'recover_margin_pct',
+                                            'label': '恢复迟滞余量（%）',
+                                            'placeholder': '2'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'interval_minutes',
+                                            'label': '检查间隔（分钟）',
+                                            'placeholder': '30'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'cooldown_minutes',
+                                            'label': '告警冷却（分钟）',
+                                            'placeholder': '120'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextarea',
+                                        'props': {
+                                            'model': 'paths',
+                                            'label': '监控路径',
+                                            'rows': 3,
+                                            'placeholder': '每行一个路径，或用英文逗号分隔，如 /downloads'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VAlert',
+                                        'props': {
+                                            'type': 'info',
+                                            'variant': 'tonal',
+                                            'text': '低于阈值发送告警通知，恢复后发送恢复通知' + '\n' +
+                                                    '交互命令 /disk_check 可随时查询各路径空间状态',
+                                            'style': 'white-space: pre-line;'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                ]
+            }
+        ], {
+            "enabled": False,
+            "paths": "",
+            "threshold_pct": 10,
+            "recover_margin_pct": 2,
+            "interval_minutes": 30,
+            "cooldown_minutes": 120,
+            "only_once_until_recover": True,
+            "ignore_missing_path": False,
+        }
+
+    def get_page(self) -> List[dict]:
+        return []
+
+    def stop_service(self):
+        """
+        退出插件
+        """
+        try:
+            # 告警状态落盘，单调钟时间戳折算成 epoch 存储；
+            # 本次会话没有任何状态时不覆盖上一次的落盘值
+            if self._last_alert_at or self._alerted_under_threshold:
+                mono_now = time.monotonic()
+                epoch_now = time.time()
+                self.save_data("alert_state", {
+                    "last_alert_at": {path: epoch_now - (mono_now - ts)
+                                      for path, ts in self._last_alert_at.items()},
+                    "alerted": self._alerted_under_threshold,
+                })
+            if self._scheduler:
+                self._scheduler.remove_all_jobs()
+                if self._scheduler.running:
+                    self._scheduler.shutdown()
+                self._scheduler = None
+            if self._pool:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+        except Exception as e:
+            logger.error("退出插件失败：%s" % str(e))